@@ -11,6 +11,12 @@ The server is implemented in Python.
 Configuration:
   - Reads settings from config/server.config (JSON)
   - Requires "base_url" (STRING API endpoint) and "server_port"
+  - Optional "log_level" for the HTTP server (default "warning")
+  - Optional "cache_ttl" / "cache_size" for the STRING response cache (default 600 s / 1024 entries)
+  - Optional "cache_max_bytes" / "cache_max_entry_bytes" byte limits for that cache (default 256 MiB / 8 MiB)
+  - Optional "caller_identity" sent to STRING with every request (default "string-mcp")
+  - Optional "uds" path to reach STRING through a local plain-HTTP proxy's unix socket,
+    with "uds_base_url" as the origin used over it (default: base_url's host over http)
 
 Run:
   python server.py
@@ -20,8 +26,10 @@ The server listens on the configured port and serves tools via streamable-http t
 Requirements:
 
 fastmcp>=2.10.6,<2.11
-httpx>=0.28,<0.29
+httpx[http2,brotli]>=0.28,<0.29
+orjson>=3.9
 pydantic>=2.11,<2.12
+uvloop>=0.19 (optional, not on Windows)
 
 Creator: meringlab
 Contact email: damian.szklarczyk@sib.swiss 
@@ -32,12 +40,22 @@ License: CC-BY-4.0
 import sys
 import json
 import time
+import heapq
 import httpx
+import orjson
 import asyncio
+import operator
+import functools
 import traceback
 
-from collections import defaultdict
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+from collections import Counter, OrderedDict, defaultdict
 from typing import Annotated, Optional
+from urllib.parse import urlencode
 
 from pydantic import Field
 from fastmcp import FastMCP
@@ -45,9 +63,9 @@ from fastmcp import FastMCP
 from string_help import HELP_TOPICS
 
 try:
-    with open("config/server.config") as f:
-        config = json.load(f)
-except (FileNotFoundError, json.JSONDecodeError) as e:
+    with open("config/server.config", "rb") as f:
+        config = orjson.loads(f.read())
+except (FileNotFoundError, orjson.JSONDecodeError) as e:
     sys.stderr.write(f"Error loading config: {e}\n")
     sys.exit(1)
 
@@ -64,6 +82,24 @@ if not server_port:
 
 timeout = float(config.get("timeout", 100))
 
+# Cache for deterministic STRING lookups (seconds / entries); ttl 0 disables it
+cache_ttl = float(config.get("cache_ttl", 600))
+cache_size = int(config.get("cache_size", 1024))
+# Bodies are cached decompressed, so also bound the cache by bytes (total / per response)
+cache_max_bytes = int(config.get("cache_max_bytes", 256 * 1024 * 1024))
+cache_max_entry_bytes = int(config.get("cache_max_entry_bytes", 8 * 1024 * 1024))
+
+# Sent with every STRING request as `caller_identity` so STRING can attribute API traffic
+caller_identity = str(config.get("caller_identity", "string-mcp"))
+
+# Optional unix socket of a co-located plain-HTTP proxy in front of STRING. Requests over
+# the socket go to an http:// origin ("uds_base_url", default: base_url's host over http);
+# base_url itself stays the public address used in the links handed to users.
+string_uds = config.get("uds")
+api_base_url = base_url
+if string_uds:
+    api_base_url = config.get("uds_base_url") or str(httpx.URL(base_url).copy_with(scheme="http"))
+
 
 def _normalize_required_score(required_score: Optional[int]) -> Optional[int]:
     if required_score is None:
@@ -80,6 +116,37 @@ def _normalize_required_score(required_score: Optional[int]) -> Optional[int]:
         return 0
 
 
+def _dedupe_identifiers(identifiers: str) -> str:
+    """Drop empty and repeated entries from a %0d-separated identifier list, keeping order."""
+    if not isinstance(identifiers, str):
+        return identifiers
+
+    # single identifier: nothing to split or dedupe
+    if "%0d" not in identifiers and "%0D" not in identifiers:
+        return identifiers
+
+    entries = identifiers.replace("%0D", "%0d").split("%0d")
+    return "%0d".join(dict.fromkeys(entry for entry in entries if entry))
+
+
+# tool argument name -> STRING API parameter name, where the two differ
+STRING_PARAM_ALIASES = {
+    "show_sequence": "add_sequence",
+    "extend_network": "add_white_nodes",
+    "do_not_show_structures": "block_structure_pics_in_bubbles",
+}
+
+
+def _with_optional_params(params: dict, **optional) -> dict:
+    """Add the optional tool arguments that were set (not None) to `params`, under their STRING API names."""
+    params.update(
+        (STRING_PARAM_ALIASES.get(name, name), value)
+        for name, value in optional.items()
+        if value is not None
+    )
+    return params
+
+
 ## logging verbosity ## 
 
 log_verbosity = {}
@@ -100,13 +167,199 @@ if 'verbosity' in config:
         log_verbosity['params'] = False
         log_verbosity['size'] = True
 
+# fixed after startup; read as plain booleans on every logged call
+LOG_CALL = bool(log_verbosity['call'])
+LOG_PARAMS = bool(log_verbosity['params'])
+LOG_SIZE = bool(log_verbosity['size'])
+
+# uvicorn/FastMCP log level; INFO logs every request, so default to warnings only
+server_log_level = str(config.get("log_level", "warning")).lower()
+
+
+async def _raise_for_status(response):
+    if not response.is_success:
+        # read the body first so the error handlers can include STRING's message
+        await response.aread()
+        response.raise_for_status()
+
+
+# One pooled client for all tool calls, so consecutive STRING requests reuse
+# open connections (and TLS sessions) instead of reconnecting every time.
+http_limits = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60)
+http_client = httpx.AsyncClient(
+    base_url=api_base_url,
+    headers={"User-Agent": f"string-mcp (python-httpx/{httpx.__version__})"},
+    timeout=httpx.Timeout(timeout, connect=10.0),
+    http2=True,
+    limits=http_limits,
+    transport=httpx.AsyncHTTPTransport(uds=string_uds, http2=True, limits=http_limits) if string_uds else None,
+    event_hooks={"response": [_raise_for_status]},
+)
+
+
+# endpoint/params key -> (expiry, raw response body). Bodies are stored as bytes
+# and decoded on every hit, so callers are free to mutate the returned rows.
+response_cache = OrderedDict()
+response_cache_bytes = 0  # total len() of the cached bodies
+
+
+def _cache_get(key):
+    global response_cache_bytes
+
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+
+    expires, body = entry
+    if expires < time.monotonic():
+        del response_cache[key]
+        response_cache_bytes -= len(body)
+        return None
+
+    response_cache.move_to_end(key)
+    return body
+
+
+def _cache_put(key, body):
+    global response_cache_bytes
+
+    if cache_ttl <= 0 or cache_size <= 0 or len(body) > min(cache_max_entry_bytes, cache_max_bytes):
+        return
+
+    previous = response_cache.pop(key, None)
+    if previous is not None:
+        response_cache_bytes -= len(previous[1])
+
+    response_cache[key] = (time.monotonic() + cache_ttl, body)
+    response_cache_bytes += len(body)
+    while len(response_cache) > cache_size or response_cache_bytes > cache_max_bytes:
+        _, (_, evicted) = response_cache.popitem(last=False)
+        response_cache_bytes -= len(evicted)
+
+
+# STRING API calls are form POSTs; the body is url-encoded directly instead of via httpx's data= path
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# the caller_identity field is the same on every request, so encode it once
+CALLER_IDENTITY_FIELD = b"&" + urlencode({"caller_identity": caller_identity}).encode("ascii")
+
+
+def _form_value(value):
+    # same conversions as httpx's data= encoding
+    if value is None:
+        return ""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return value
+
+
+def _encode_form(params: dict) -> bytes:
+    """URL-encode form params exactly like httpx's data= did (None -> empty, booleans -> true/false, lists repeated)."""
+    return urlencode([
+        (name, _form_value(item))
+        for name, value in params.items()
+        for item in (value if isinstance(value, (list, tuple)) else (value,))
+    ]).encode("ascii")
+
+
+# endpoint/params key -> [task fetching that request, number of callers awaiting it],
+# shared by identical concurrent calls
+inflight_requests = {}
+
+# endpoints with side effects: every call must reach STRING, so they are never shared
+UNCOALESCED_ENDPOINTS = frozenset({
+    "/api/json/generate_chat_file",
+})
+
+# endpoints whose result describes the identifier set as a whole, so the
+# order the proteins were listed in does not change the response
+ORDER_INSENSITIVE_ENDPOINTS = frozenset({
+    "/api/json/enrichment",
+    "/api/json/ppi_enrichment",
+})
+
+
+def _request_key(endpoint: str, data: dict):
+    # Each tool builds its params in a fixed order, so the items can be used
+    # as they are; no need to sort them on every call.
+    identifiers = data.get("identifiers")
+    if endpoint in ORDER_INSENSITIVE_ENDPOINTS and isinstance(identifiers, str) and "%0d" in identifiers:
+        return (endpoint, tuple(
+            (name, "%0d".join(sorted(value.split("%0d")))) if name == "identifiers" else (name, value)
+            for name, value in data.items()
+        ))
+    return (endpoint, tuple(data.items()))
+
 
-async def _post_json(client: httpx.AsyncClient, endpoint: str, data: dict):
+async def _post_json(endpoint: str, data: dict, request_timeout=httpx.USE_CLIENT_DEFAULT, cache=False):
     """
     POST form data to a STRING API endpoint and return JSON.
+    Identical requests that are already in flight share a single upstream call.
+    Pass `request_timeout` to override the client default for slow endpoints.
+    With `cache=True`, successful responses are reused for identical requests for `cache_ttl` seconds.
+    """
+    request_key = _request_key(endpoint, data)
+
+    body = _cache_get(request_key) if cache else None
+    fetched = body is None
+
+    if fetched:
+        if endpoint in UNCOALESCED_ENDPOINTS:
+            body = await _fetch_string(endpoint, data, request_timeout)
+        else:
+            body = await _fetch_shared(request_key, endpoint, data, request_timeout)
+
+    if isinstance(body, dict):
+        return body  # error payload
+
+    try:
+        results = orjson.loads(body)
+    except ValueError:
+        return {"result": body.decode("utf-8", errors="replace")}
+
+    if cache and fetched and not (isinstance(results, dict) and "error" in results):
+        _cache_put(request_key, body)
+    return results
+
+
+async def _fetch_shared(request_key, endpoint: str, params: dict, request_timeout):
+    """
+    Await the in-flight fetch for `request_key`, starting it if there is none.
+    The fetch is cancelled once every caller waiting on it has been cancelled.
+    """
+    entry = inflight_requests.get(request_key)
+    if entry is None:
+        entry = [asyncio.ensure_future(_fetch_string(endpoint, params, request_timeout)), 0]
+        inflight_requests[request_key] = entry
+
+        def _forget(_, entry=entry):
+            if inflight_requests.get(request_key) is entry:
+                del inflight_requests[request_key]
+
+        entry[0].add_done_callback(_forget)
+
+    task = entry[0]
+    entry[1] += 1
+    try:
+        # shield: a cancelled caller must not cancel the request for the others
+        return await asyncio.shield(task)
+    finally:
+        entry[1] -= 1
+        if not entry[1] and not task.done():
+            # the last caller is gone: stop the upstream request (and its ping loop)
+            task.cancel()
+            if inflight_requests.get(request_key) is entry:
+                del inflight_requests[request_key]
+
+
+async def _fetch_string(endpoint: str, params: dict, request_timeout):
+    """
+    POST form data to a STRING API endpoint and return the raw response body,
+    or an error payload (dict) if the request failed.
     Emits periodic 'ping' SSE events to keep upstream connections alive (e.g. Cloudflare).
     """
-    params = data
     ping_interval = 25  # seconds between pings
 
     async def _ping_loop(done_event: asyncio.Event):
@@ -123,12 +376,14 @@ async def _post_json(client: httpx.AsyncClient, endpoint: str, data: dict):
     ping_task = asyncio.create_task(_ping_loop(done_event))
 
     try:
-        response = await client.post(endpoint, data=params)
-        response.raise_for_status()
-        try:
-            return response.json()
-        except ValueError:
-            return {"result": response.text}
+        # non-2xx responses raise HTTPStatusError from the client's response hook
+        response = await http_client.post(
+            endpoint,
+            content=_encode_form(params) + CALLER_IDENTITY_FIELD,
+            headers=FORM_HEADERS,
+            timeout=request_timeout,
+        )
+        return response.content
 
     except httpx.ReadTimeout:
         # Specific handling for slow or non-responsive STRING API calls
@@ -153,7 +408,7 @@ async def _post_json(client: httpx.AsyncClient, endpoint: str, data: dict):
     except httpx.HTTPStatusError as e:
         status = e.response.status_code
         try:
-            server_detail = e.response.json()
+            server_detail = orjson.loads(e.response.content)
         except Exception:
             server_detail = e.response.text
 
@@ -222,8 +477,14 @@ async def _post_json(client: httpx.AsyncClient, endpoint: str, data: dict):
         ping_task.cancel()
 
 
+def _serialize_tool_result(data) -> str:
+    """Serialize tool results for the MCP transport with orjson (compact, no indent)."""
+    return orjson.dumps(data, default=str).decode()
+
+
 mcp = FastMCP(
     name="STRING Database MCP Server",
+    tool_serializer=_serialize_tool_result,
 )
 
 @mcp.tool(title="STRING: Resolves protein identifiers to metadata")
@@ -265,19 +526,19 @@ async def string_resolve_proteins(
     """
 
    
-    params = {"identifiers": proteins, "echo_query": 1, 'add_domains': 1}
-    if species is not None:
-        params["species"] = species
+    proteins = _dedupe_identifiers(proteins)
 
-    if show_sequence is not None:
-        params["add_sequence"] = show_sequence
+    params = _with_optional_params(
+        {"identifiers": proteins, "echo_query": 1, 'add_domains': 1},
+        species=species,
+        show_sequence=show_sequence,
+    )
 
     endpoint = "/api/json/get_string_ids"
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        log_response_size(results)
-        return {"mapped_proteins": results}
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params, cache=True)
+    log_response_size(results)
+    return {"mapped_proteins": results}
 
 
 @mcp.tool(title="STRING: Get interactions within query set")
@@ -344,19 +605,17 @@ async def string_interactions_query_set(
         `ascore` (coexpression), `escore` (experimental), `dscore` (database), `tscore` (text-mining)
     """
 
+    proteins = _dedupe_identifiers(proteins)
     required_score = _normalize_required_score(required_score)
 
-    params = {"identifiers": proteins}
-    if species is not None:
-        params["species"] = species
-    if required_score is not None:
-        params["required_score"] = required_score
-    if network_type is not None:
-        params["network_type"] = network_type
-    if extend_network is not None:
-        params["add_white_nodes"] = extend_network
-    #if show_query_node_labels is not None:
-    #    params["show_query_node_labels"] = show_query_node_labels
+    params = _with_optional_params(
+        {"identifiers": proteins},
+        species=species,
+        required_score=required_score,
+        network_type=network_type,
+        extend_network=extend_network,
+        # show_query_node_labels=show_query_node_labels,
+    )
 
     add_score_note = False
     add_shared_note = False
@@ -372,47 +631,100 @@ async def string_interactions_query_set(
 
     endpoint = "/api/json/network"
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        if 'error' in results: return results
-        else:
-            formatted_network = format_query_set_network(results, required_score)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params)
+    if 'error' in results: return results
+    else:
+        formatted_network = format_query_set_network(results, required_score)
 
-        notes = []
+    notes = []
 
 
-        if add_score_note:
-            notes.append("The required_score parameter was lowered to 0 - showing all interactions. "
-                         "IMPORTANT: If the interaction score is low (below 400), inform user about it.")
-        if not len(formatted_network["network"]):
-             notes.append(f"No interactions found in STRING database at that {required_score} cut-off.")
+    if add_score_note:
+        notes.append("The required_score parameter was lowered to 0 - showing all interactions. "
+                     "IMPORTANT: If the interaction score is low (below 400), inform user about it.")
+    if not len(formatted_network["network"]):
+         notes.append(f"No interactions found in STRING database at that {required_score} cut-off.")
 
-        notes.extend(formatted_network["notes"])
+    notes.extend(formatted_network["notes"])
      
-        if add_shared_note:
-            notes.append(
-                "For two- and three-protein queries, the network was expanded by five additional proteins to reveal possible shared or indirect interactions between the queried proteins. "
-                "Report only interactions that are directly between the queried proteins or that form a clear shared-interactor/indirect path connecting the queried proteins. "
-                "Do not mention expanded-network edges that are unrelated to the relationship between the queried proteins. "
-                "For a more thorough investigation of shared interactors, use the `string_all_interaction_partners` tool."
-            )
+    if add_shared_note:
+        notes.append(
+            "For two- and three-protein queries, the network was expanded by five additional proteins to reveal possible shared or indirect interactions between the queried proteins. "
+            "Report only interactions that are directly between the queried proteins or that form a clear shared-interactor/indirect path connecting the queried proteins. "
+            "Do not mention expanded-network edges that are unrelated to the relationship between the queried proteins. "
+            "For a more thorough investigation of shared interactors, use the `string_all_interaction_partners` tool."
+        )
 
-        response = {
-            "notes": notes,
-            "network_summary": formatted_network["network_summary"],
-            "network": formatted_network["network"],
-        }
+    response = {
+        "notes": notes,
+        "network_summary": formatted_network["network_summary"],
+        "network": formatted_network["network"],
+    }
 
-        if formatted_network["node_interaction_counts"]:
-            response["node_interaction_counts"] = formatted_network["node_interaction_counts"]
+    if formatted_network["node_interaction_counts"]:
+        response["node_interaction_counts"] = formatted_network["node_interaction_counts"]
 
-        if formatted_network["edge_sample"]:
-            response["edge_sample"] = formatted_network["edge_sample"]
+    if formatted_network["edge_sample"]:
+        response["edge_sample"] = formatted_network["edge_sample"]
 
-        log_response_size(response)
+    log_response_size(response)
 
-        return response
+    return response
+
+
+@mcp.tool(title="STRING: Resolve proteins and get their interaction network")
+async def string_resolve_and_network(
+    proteins: Annotated[
+        str,
+        Field(description=(
+            "Required. One or more protein identifiers, separated by carriage return (%0d). "
+            "Example: SMO%0dTP53"
+        ))
+    ],
+    species: Annotated[
+        str,
+        Field(description=(
+            "Optional. NCBI taxonomy ID (e.g. 9606 for human) or STRING genome ID "
+            "(e.g. STRG0AXXXXX for uploaded genomes)."
+        ))
+    ] = None,
+    required_score: Annotated[
+        Optional[int],
+        Field(description=(
+            "Optional. Minimum confidence score for an interaction (range: 0–1000). "
+            "Only set this if the user explicitly requests it."
+        ))
+    ] = None,
+    network_type: Annotated[
+        Optional[str],
+        Field(description=(
+            'Optional. Network type: "functional" (default) or "physical" (co-complex).'
+        ))
+    ] = None,
+) -> dict:
+    """
+    Resolves the query proteins to STRING metadata and retrieves the interactions between them in one call.
+
+    Use this instead of calling `string_resolve_proteins` followed by `string_interactions_query_set`
+    with the same identifiers. Both requests are sent to STRING concurrently.
+
+    - `mapped_proteins` has the same content as the output of `string_resolve_proteins`.
+    - `network` has the same content as the output of `string_interactions_query_set`,
+      including its notes.
+    """
+
+    mapped, network = await asyncio.gather(
+        string_resolve_proteins.fn(proteins, species=species),
+        string_interactions_query_set.fn(
+            proteins,
+            species=species,
+            required_score=required_score,
+            network_type=network_type,
+        ),
+    )
+
+    return {"mapped_proteins": mapped["mapped_proteins"], "network": network}
 
 
 @mcp.tool(title="STRING: Get all interaction partners for proteins")
@@ -461,42 +773,40 @@ async def string_all_interaction_partners(
         `ascore` (coexpression), `escore` (experimental), `dscore` (database), `tscore` (text mining)
     """
 
+    identifiers = _dedupe_identifiers(identifiers)
     required_score = _normalize_required_score(required_score)
 
-    params = {"identifiers": identifiers, "limit": 0}
-
-    if species is not None:
-        params["species"] = species
-    if required_score is not None:
-        params["required_score"] = required_score
-    if network_type is not None:
-        params["network_type"] = network_type
+    params = _with_optional_params(
+        {"identifiers": identifiers, "limit": 0},
+        species=species,
+        required_score=required_score,
+        network_type=network_type,
+    )
 
     endpoint = "/api/json/interaction_partners"
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        if 'error' in results:
-            log_response_size(results)
-            return results
-        else:
-            formatted_interactions = format_interaction_partners(results, required_score)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params)
+    if 'error' in results:
+        log_response_size(results)
+        return results
+    else:
+        formatted_interactions = format_interaction_partners(results, required_score)
 
-        notes = []
+    notes = []
 
-        notes.extend(formatted_interactions["notes"])
+    notes.extend(formatted_interactions["notes"])
 
-        if not len(formatted_interactions["interactions"]):
-             notes.append(f"No interactions found in STRING database at that {required_score} cut-off. Consider lowering the required_score.")
+    if not len(formatted_interactions["interactions"]):
+         notes.append(f"No interactions found in STRING database at that {required_score} cut-off. Consider lowering the required_score.")
 
-        response = {
-            "notes": notes,
-            "node_summary": formatted_interactions["node_summary"],
-            "interactions": formatted_interactions["interactions"],
-        }
+    response = {
+        "notes": notes,
+        "node_summary": formatted_interactions["node_summary"],
+        "interactions": formatted_interactions["interactions"],
+    }
         
-        log_response_size(response)
-        return response
+    log_response_size(response)
+    return response
 
 
 @mcp.tool(title="STRING: Get interaction network image (image URL)")
@@ -581,29 +891,22 @@ async def string_visual_network(
     Input parameters should match those used in related STRING tools (e.g. `string_interactions_query_set`), unless otherwise specified.
 
     """
+    proteins = _dedupe_identifiers(proteins)
     required_score = _normalize_required_score(required_score)
 
-    params = {"identifiers": proteins}
-    if species is not None:
-        params["species"] = species
-    if extend_network is not None:
-        params["add_white_nodes"] = extend_network
-    if required_score is not None:
-        params["required_score"] = required_score
-    if network_type is not None:
-        params["network_type"] = network_type
-    if network_flavor is not None:
-        params["network_flavor"] = network_flavor
-    if hide_disconnected_nodes is not None:
-        params["hide_disconnected_nodes"] = hide_disconnected_nodes
-    if do_not_show_structures is not None:
-        params["block_structure_pics_in_bubbles"] = do_not_show_structures
-    #if show_query_node_labels is not None:
-    #    params["show_query_node_labels"] = show_query_node_labels
-    if center_node_labels is not None:
-        params["center_node_labels"] = center_node_labels
-    #if custom_label_font_size is not None:
-    #    params["custom_label_font_size"] = custom_label_font_size
+    params = _with_optional_params(
+        {"identifiers": proteins},
+        species=species,
+        extend_network=extend_network,
+        required_score=required_score,
+        network_type=network_type,
+        network_flavor=network_flavor,
+        hide_disconnected_nodes=hide_disconnected_nodes,
+        do_not_show_structures=do_not_show_structures,
+        # show_query_node_labels=show_query_node_labels,
+        center_node_labels=center_node_labels,
+        # custom_label_font_size=custom_label_font_size,
+    )
 
     endpoint = f"/api/json/network_image_url"
 
@@ -619,32 +922,31 @@ async def string_visual_network(
         add_shared_note = True
 
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params)
 
-        notes = []
+    notes = []
 
-        if add_score_note:
-            notes.append("For small queries, the `required_score` parameter was lowered to 0.")
-        notes.append("Internal guidance: do not repeat this note to the user. The user can inspect the generated image, "
-                     "but you should not infer or report specific interaction details from the image alone. "
-                     "Use `string_interactions_query_set` with the same parameters to verify direct or indirect interactions.")
+    if add_score_note:
+        notes.append("For small queries, the `required_score` parameter was lowered to 0.")
+    notes.append("Internal guidance: do not repeat this note to the user. The user can inspect the generated image, "
+                 "but you should not infer or report specific interaction details from the image alone. "
+                 "Use `string_interactions_query_set` with the same parameters to verify direct or indirect interactions.")
 
-        if add_shared_note:
-            notes.append(
-                "For two- and three-protein queries, the network image was expanded by five additional proteins to reveal possible shared or indirect interactions between the queried proteins. "
-                "Do not infer interactions from the image alone; use `string_interactions_query_set` with the same parameters to verify whether direct or indirect interactions are present. "
-                "Report only interactions that are directly between the queried proteins or that form a clear shared-interactor/indirect path connecting the queried proteins. "
-                "Do not mention expanded-network edges that are unrelated to the relationship between the queried proteins. "
-                "For a more thorough investigation of shared interactors, use the `string_all_interaction_partners` tool.")
+    if add_shared_note:
+        notes.append(
+            "For two- and three-protein queries, the network image was expanded by five additional proteins to reveal possible shared or indirect interactions between the queried proteins. "
+            "Do not infer interactions from the image alone; use `string_interactions_query_set` with the same parameters to verify whether direct or indirect interactions are present. "
+            "Report only interactions that are directly between the queried proteins or that form a clear shared-interactor/indirect path connecting the queried proteins. "
+            "Do not mention expanded-network edges that are unrelated to the relationship between the queried proteins. "
+            "For a more thorough investigation of shared interactors, use the `string_all_interaction_partners` tool.")
 
-        notes.append("Embed the returned image link directly in the assistant response as a markdown image.")
+    notes.append("Embed the returned image link directly in the assistant response as a markdown image.")
 
  
-        log_response_size(results)
+    log_response_size(results)
 
-        return {"notes": notes, "image_url": results}
+    return {"notes": notes, "image_url": results}
 
 
 @mcp.tool(title="STRING: Perform network clustering")
@@ -721,21 +1023,19 @@ async def string_network_clustering(
 
     """
 
+    proteins = _dedupe_identifiers(proteins)
     required_score = _normalize_required_score(required_score)
 
-    params = {"identifiers": proteins}
-    if species is not None:
-        params["species"] = species
-    if extend_network is not None:
-        params["add_white_nodes"] = extend_network
-    if required_score is not None:
-        params["required_score"] = required_score
-    if network_type is not None:
-        params["network_type"] = network_type
-    if network_flavor is not None:
-        params["network_flavor"] = network_flavor
-    if hide_disconnected_nodes is not None:
-        params["hide_disconnected_nodes"] = hide_disconnected_nodes
+    params = _with_optional_params(
+        {"identifiers": proteins},
+        species=species,
+        extend_network=extend_network,
+        required_score=required_score,
+        network_type=network_type,
+        network_flavor=network_flavor,
+        hide_disconnected_nodes=hide_disconnected_nodes,
+        center_node_labels=center_node_labels,
+    )
 
 
     # default
@@ -774,9 +1074,6 @@ async def string_network_clustering(
         params['network_clustering_parameter_mcl'] = clustering_parameter
 
 
-    if center_node_labels is not None:
-        params["center_node_labels"] = center_node_labels
-
     endpoint = f"/api/json/network_image_url"
 
     add_score_note = False
@@ -784,32 +1081,31 @@ async def string_network_clustering(
         params["required_score"] = 0
         add_score_note = True
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params)
 
-        notes = []
-        if add_score_note:
-            notes.append("For small queries, the required_score parameter is automatically lowered to 0.")
-        notes.append("Embed the returned image link directly in the assistant response as a markdown image.")
+    notes = []
+    if add_score_note:
+        notes.append("For small queries, the required_score parameter is automatically lowered to 0.")
+    notes.append("Embed the returned image link directly in the assistant response as a markdown image.")
 
-        log_response_size(results)
+    log_response_size(results)
 
-        image_url = None
-        if results and isinstance(results, list) and "imageURL" in results[0]:
-            image_url = results[0].get("imageURL")
-            for cluster in results:
-                cluster.pop("imageURL", None)
+    image_url = None
+    if results and isinstance(results, list) and "imageURL" in results[0]:
+        image_url = results[0].get("imageURL")
+        for cluster in results:
+            cluster.pop("imageURL", None)
         
-        clustering_note = get_clustering_structure_note(results, clustering_algorithm)
-        if clustering_note:
-            notes.append(clustering_note)
+    clustering_note = get_clustering_structure_note(results, clustering_algorithm)
+    if clustering_note:
+        notes.append(clustering_note)
 
-        return {
-            "image_url": image_url,
-            "clusters": results,
-            "notes": notes,
-        }
+    return {
+        "image_url": image_url,
+        "clusters": results,
+        "notes": notes,
+    }
 
 
 
@@ -881,21 +1177,18 @@ async def string_network_link(
     
     Input parameters should match those used in related STRING tools unless otherwise specified.
     """
+    proteins = _dedupe_identifiers(proteins)
     required_score = _normalize_required_score(required_score)
 
-    params = {"identifiers": proteins}
-    if species is not None:
-        params["species"] = species
-    if extend_network is not None:
-        params["add_white_nodes"] = extend_network
-    if required_score is not None:
-        params["required_score"] = required_score
-    if network_flavor is not None:
-        params["network_flavor"] = network_flavor
-    if network_type is not None:
-        params["network_type"] = network_type
-    if hide_disconnected_nodes is not None:
-        params["hide_disconnected_nodes"] = hide_disconnected_nodes
+    params = _with_optional_params(
+        {"identifiers": proteins},
+        species=species,
+        extend_network=extend_network,
+        required_score=required_score,
+        network_flavor=network_flavor,
+        network_type=network_type,
+        hide_disconnected_nodes=hide_disconnected_nodes,
+    )
 
 
     add_score_note = False
@@ -911,27 +1204,26 @@ async def string_network_link(
 
     endpoint = f"/api/json/get_link"
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params)
 
-        notes = []
-        if add_score_note:
-            notes.append(f"For small queries the required_score parameter is lowered to 0.")
+    notes = []
+    if add_score_note:
+        notes.append(f"For small queries the required_score parameter is lowered to 0.")
 
-        if add_shared_note:
-            notes.append(
-                "For two- and three-protein queries, the network link was expanded by five additional proteins to reveal possible shared or indirect interactions between the queried proteins. "
-                "When describing the link, tell the user they can inspect it for a potential direct interaction or clear shared-interactor/indirect path connecting the queried proteins. "
-                "Do not mention unrelated expanded-network edges as evidence about the relationship between the queried proteins."
-            )
+    if add_shared_note:
+        notes.append(
+            "For two- and three-protein queries, the network link was expanded by five additional proteins to reveal possible shared or indirect interactions between the queried proteins. "
+            "When describing the link, tell the user they can inspect it for a potential direct interaction or clear shared-interactor/indirect path connecting the queried proteins. "
+            "Do not mention unrelated expanded-network edges as evidence about the relationship between the queried proteins."
+        )
  
 
-        notes.append("Embed the returned link directly in the assistant response as a markdown hyperlink.")
+    notes.append("Embed the returned link directly in the assistant response as a markdown hyperlink.")
  
-        log_response_size(results)
+    log_response_size(results)
 
-        return {"notes": notes, "results": results}
+    return {"notes": notes, "results": results}
 
 
 @mcp.tool(title="STRING: Get homologs in specified target species")
@@ -960,24 +1252,24 @@ async def string_homology(
     - Results are truncated to the top 50 proteins per input protein.
     """
 
-    params = {"identifiers": proteins}
-    if species is not None:
-        params["species"] = species
+    proteins = _dedupe_identifiers(proteins)
 
-    if species_b is not None:
-        params["species_b"] = species_b
+    params = _with_optional_params(
+        {"identifiers": proteins},
+        species=species,
+        species_b=species_b,
+    )
 
     endpoint = f"/api/json/homology_all"
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        if 'error' in results:
-            log_response_size(results)
-            return results
-        grouped_results = group_homology_results(results)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params, cache=True)
+    if 'error' in results:
+        log_response_size(results)
+        return results
+    grouped_results = group_homology_results(results)
 
-        log_response_size(grouped_results)
-        return {"results": grouped_results}
+    log_response_size(grouped_results)
+    return {"results": grouped_results}
 
 
 @mcp.tool(title="STRING: Get links to interaction evidence pages")
@@ -1019,12 +1311,18 @@ async def string_interaction_evidence(
     - "Where can I find the STRING evidence page for this pair?"
     """
 
-    identifiers_b = identifiers_b.replace('%0D', '%0d')
+    identifiers_b = _dedupe_identifiers(identifiers_b)
 
-    output = []
-    for identifier_b in identifiers_b.split("%0d"):
-        link = f"{base_url}/interaction/{identifier_a}/{identifier_b}?species={species}&suppress_disambiguation=1"
-        output.append(link)
+    link_prefix = f"{base_url}/interaction/{identifier_a}/"
+    link_suffix = f"?species={species}&suppress_disambiguation=1"
+    if "%0d" not in identifiers_b:
+        output = [f"{link_prefix}{identifiers_b}{link_suffix}"] if identifiers_b else []
+    else:
+        output = [
+            f"{link_prefix}{identifier_b}{link_suffix}"
+            for identifier_b in identifiers_b.split("%0d")
+            if identifier_b
+        ]
 
     notes = []
     notes.append(
@@ -1091,41 +1389,43 @@ async def string_enrichment(
         where `truncated` is true or where the user wants deeper category-specific detail.
       - truncated_categories / omitted_categories: Categories with terms not shown in the current response.
     """
-    params = {"identifiers": proteins}
-    if species is not None:
-        params["species"] = species
+    proteins = _dedupe_identifiers(proteins)
 
-    endpoint = f"/api/json/enrichment"
+    params = _with_optional_params(
+        {"identifiers": proteins},
+        species=species,
+    )
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        if 'error' in results:
-            log_response_size(results)
-            return results
-        else:
-            results_truncated, truncation_notes, metadata = truncate_enrichment(
-                results, 'json', expand_category=expand_category
-            )
+    endpoint = f"/api/json/enrichment"
 
-        notes = []
-        notes.extend(truncation_notes)
-        if not results_truncated:
-            if expand_category:
-                notes.append(
-                    f"AGENT MUST tell the user: No statistically significant enrichment terms were found "
-                    f"for category `{expand_category}`."
-                )
-            else:
-                notes.append("AGENT MUST tell the user: No statistically significant enrichment was observed. "
-                             "This means the proteins in their list do not group into known pathways or functions "
-                             "more than would be expected by random chance.")
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params, cache=True)
+    if 'error' in results:
+        log_response_size(results)
+        return results
+    else:
+        results_truncated, truncation_notes, metadata = truncate_enrichment(
+            results, expand_category=expand_category
+        )
 
-        log_response_size(results_truncated)
-        response = {"notes": notes, "results": results_truncated}
-        if metadata:
-            response["metadata"] = metadata
-        return response
+    notes = []
+    notes.extend(truncation_notes)
+    if not results_truncated:
+        if expand_category:
+            notes.append(
+                f"AGENT MUST tell the user: No statistically significant enrichment terms were found "
+                f"for category `{expand_category}`."
+            )
+        else:
+            notes.append("AGENT MUST tell the user: No statistically significant enrichment was observed. "
+                         "This means the proteins in their list do not group into known pathways or functions "
+                         "more than would be expected by random chance.")
+
+    log_response_size(results_truncated)
+    response = {"notes": notes, "results": results_truncated}
+    if metadata:
+        response["metadata"] = metadata
+    return response
 
 
 @mcp.tool(title="STRING: Retrieve functional annotations for proteins")
@@ -1163,20 +1463,21 @@ async def string_functional_annotation(
       - term: Functional term or ID
     """
 
+    identifiers = _dedupe_identifiers(identifiers)
+
     endpoint = "/api/json/functional_annotation"
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        params = {"identifiers": identifiers, "species": species, "apiAllowKegg": 1}
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        if 'error' in results:
-            log_response_size(results)
-            return results
-        else:
-             results_truncated, truncation_notes = sort_and_truncate_functional_annotation(results, 'json', detail_for_term)
+    params = {"identifiers": identifiers, "species": species, "apiAllowKegg": 1}
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params, cache=True)
+    if 'error' in results:
+        log_response_size(results)
+        return results
+    else:
+         results_truncated, truncation_notes = sort_and_truncate_functional_annotation(results, 'json', detail_for_term)
 
-        log_response_size(results_truncated)
-        return {"notes": truncation_notes, "results": results_truncated}  # Functional annotation per protein
+    log_response_size(results_truncated)
+    return {"notes": truncation_notes, "results": results_truncated}  # Functional annotation per protein
 
 
 @mcp.tool(title="STRING: Get enrichment result figure (image URL)")
@@ -1242,35 +1543,32 @@ async def string_enrichment_image_url(
 
     See the `category` parameter for a list of valid category options.
     """
-    params = {"identifiers": identifiers}
-    if species is not None:
-        params["species"] = species
-    if category is not None:
-        params["category"] = category
-    if group_by_similarity is not None:
-        params["group_by_similarity"] = group_by_similarity
-    if color_palette is not None:
-        params["color_palette"] = color_palette
-    if number_of_term_shown is not None:
-        params["number_of_term_shown"] = number_of_term_shown
-    if x_axis is not None:
-        params["x_axis"] = x_axis
+    identifiers = _dedupe_identifiers(identifiers)
+
+    params = _with_optional_params(
+        {"identifiers": identifiers},
+        species=species,
+        category=category,
+        group_by_similarity=group_by_similarity,
+        color_palette=color_palette,
+        number_of_term_shown=number_of_term_shown,
+        x_axis=x_axis,
+    )
 
     endpoint = f"/api/json/enrichment_image_url"
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        log_response_size(results)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params)
+    log_response_size(results)
 
-        notes = []
-        notes.append(
-            "If a valid URL is present in the response, embed it as markdown in the assistant message. "
-            "If no valid URL is returned, do not embed or display any link."
-        )
+    notes = []
+    notes.append(
+        "If a valid URL is present in the response, embed it as markdown in the assistant message. "
+        "If no valid URL is returned, do not embed or display any link."
+    )
  
 
-        return {"notes": notes, "results": results}
+    return {"notes": notes, "results": results}
 
 
 @mcp.tool(title="STRING: Protein–protein interaction (PPI) enrichment")
@@ -1307,21 +1605,53 @@ async def string_ppi_enrichment(
 
     Example identifiers: "SMO%0dTP53"
     """
+    identifiers = _dedupe_identifiers(identifiers)
     required_score = _normalize_required_score(required_score)
 
-    params = {"identifiers": identifiers}
-    if species is not None:
-        params["species"] = species
-    if required_score is not None:
-        params["required_score"] = required_score
+    params = _with_optional_params(
+        {"identifiers": identifiers},
+        species=species,
+        required_score=required_score,
+    )
 
     endpoint = f"/api/json/ppi_enrichment"
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params, cache=True)
 
-        log_response_size(results)
-        return {"results": results}
+    log_response_size(results)
+    return {"results": results}
+
+
+@mcp.tool(title="STRING: Functional and PPI enrichment overview")
+async def string_enrichment_overview(
+    proteins: Annotated[
+        str,
+        Field(description="Required. One or more protein identifiers, separated by %0d. Example: SMO%0dTP53")
+    ],
+    species: Annotated[
+        Optional[str],
+        Field(description="Optional. NCBI/STRING taxon (e.g. 9606 for human, or STRG0AXXXXX). DO NOT SET unless user explicitly requests.")
+    ] = None,
+) -> dict:
+    """
+    Runs functional enrichment and PPI enrichment for the same protein set in one call.
+
+    Use this instead of calling `string_enrichment` and `string_ppi_enrichment` one after the other
+    with the same proteins. Both analyses are requested from STRING concurrently.
+
+    - `functional_enrichment` has the same content as the output of `string_enrichment`; follow its
+      reporting guidance (FDR for each claim, top categories first). Use `string_enrichment` with
+      `expand_category` for deeper detail on one category.
+    - `ppi_enrichment` has the same content as the output of `string_ppi_enrichment`; report the p-value
+      as a human-readable value.
+    """
+
+    functional, ppi = await asyncio.gather(
+        string_enrichment.fn(proteins, species=species),
+        string_ppi_enrichment.fn(proteins, species=species),
+    )
+
+    return {"functional_enrichment": functional, "ppi_enrichment": ppi}
 
 
 @mcp.tool(title="STRING: Retrieve proteins associated with a functional term")
@@ -1330,7 +1660,8 @@ async def string_proteins_for_term(
         str,
         Field(description=(
             "Required. Functional term identifier (GO, KEGG, Reactome, etc.) "
-            "or descriptive free text (e.g. 'hsa05218', 'Melanoma', 'GO:0008543', 'Fibroblast growth factor')."
+            "or descriptive free text (e.g. 'hsa05218', 'Melanoma', 'GO:0008543', 'Fibroblast growth factor'). "
+            "Several terms can be queried at once, separated by carriage return (%0d), e.g. 'Melanoma%0dGO:0008543'."
         ))
     ],
     species: Annotated[
@@ -1352,6 +1683,9 @@ async def string_proteins_for_term(
     Select relevant model organisms to search or ask user to provide the selection.
     The results reflect annotation depth within each category; use caution when interpreting.
     
+    To look up several terms in the same species, pass them in one call separated by `%0d`;
+    the results are then returned per term under `results_by_term`.
+
     If no results are found, try simplifying the query.  
     For tissue queries, follow BRENDA tissue nomenclature and omit the word "tissue"  
     (e.g. use "skin" instead of "skin tissue").
@@ -1366,17 +1700,52 @@ async def string_proteins_for_term(
       - stringIds: List of STRING protein identifiers (truncated to first 100)
 
     """
-    params = {"term_text": term_text, "species": species}
-
     endpoint = "/api/json/functional_terms"
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+    term_queries = list(dict.fromkeys(
+        query.strip() for query in term_text.replace("%0D", "%0d").split("%0d") if query.strip()
+    ))
+    query_limit = 10
+
+    if len(term_queries) <= 1:
+        # send the cleaned-up term; the raw text only when nothing was left of it
+        params = {"term_text": term_queries[0] if term_queries else term_text, "species": species}
         log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
+        results = await _post_json(endpoint, data=params, cache=True)
         if 'error' in results: return results 
-        results_truncated, truncation_notes = truncate_functional_terms(results, 'json')
+        results_truncated, truncation_notes = truncate_functional_terms(results)
         log_response_size(results_truncated)
         return {"notes": truncation_notes, "results": results_truncated}
 
+    notes = []
+    if len(term_queries) > query_limit:
+        notes.append(
+            f"Only the first {query_limit} terms were processed; split longer lists into multiple calls."
+        )
+        term_queries = term_queries[:query_limit]
+
+    tasks = []
+    for query in term_queries:
+        params = {"term_text": query, "species": species}
+        log_call(endpoint, params)
+        tasks.append(_post_json(endpoint, data=params, cache=True))
+
+    results = await asyncio.gather(*tasks)
+
+    results_by_term = []
+    for query, term_results in zip(term_queries, results):
+        if isinstance(term_results, dict) and 'error' in term_results:
+            results_by_term.append({"term_text": query, "error": term_results["error"]})
+        else:
+            results_truncated, truncation_notes = truncate_functional_terms(term_results)
+            results_by_term.append({"term_text": query, "notes": truncation_notes, "results": results_truncated})
+
+    response = {"results_by_term": results_by_term}
+    if notes:
+        response["notes"] = notes
+
+    log_response_size(response)
+    return response
+
 
 @mcp.tool(title="STRING: Search proteins by amino acid sequence")
 async def string_sequence_search(
@@ -1411,19 +1780,18 @@ async def string_sequence_search(
     params = {"sequences": sequences, "species": species}
 
     endpoint = "/api/json/similarity_search"
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout*2) as client:
-        log_call(endpoint, params)
-        results = await _post_json(client, endpoint, data=params)
-        results_truncated, add_trancation_note, total_hits = truncate_similarity_search(results)
-
-        notes = []
-        if add_trancation_note:
-            notes.append(f"Results truncated to {len(results_truncated)} rows from {total_hits} original rows for readability. "
-                         "If you provided multiple sequences, only the top hits are shown per query. "
-                         "Ranking is based on bitscore; lower-scoring hits were omitted.")
+    log_call(endpoint, params)
+    results = await _post_json(endpoint, data=params, request_timeout=timeout * 2)
+    results_truncated, add_trancation_note, total_hits = truncate_similarity_search(results)
+
+    notes = []
+    if add_trancation_note:
+        notes.append(f"Results truncated to {len(results_truncated)} rows from {total_hits} original rows for readability. "
+                     "If you provided multiple sequences, only the top hits are shown per query. "
+                     "Ranking is based on bitscore; lower-scoring hits were omitted.")
             
-        log_response_size(results_truncated)
-        return {"notes": notes, "results": results_truncated}
+    log_response_size(results_truncated)
+    return {"notes": notes, "results": results_truncated}
 
 @mcp.tool(title="STRING: Query species and clades in STRING")
 async def string_query_species(
@@ -1463,48 +1831,47 @@ async def string_query_species(
     if not species_queries:
         return {"notes": ["No species query was provided."], "results": []}
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        if len(species_queries) == 1:
-            params = {"species_text": species_queries[0], 'limit': 50, 'add_sps':'t'}
-            log_call(endpoint, params)
-            results = await _post_json(client, endpoint, data=params)
-            if 'error' in results:
-                log_response_size(results)
-                return results
-            truncated_results = truncate_species_results(results)
-
-            response = {"results": truncated_results}
-            if notes:
-                response["notes"] = notes
-
-            log_response_size(response)
-            return response
-
-        tasks = []
-        for query in species_queries:
-            params = {"species_text": query, 'limit': 50, 'add_sps':'t'}
-            log_call(endpoint, params)
-            tasks.append(_post_json(client, endpoint, data=params))
-
-        results = await asyncio.gather(*tasks)
-
-        results_by_query = []
-        for query, query_results in zip(species_queries, results):
-            if isinstance(query_results, dict) and 'error' in query_results:
-                results_by_query.append({"query": query, "error": query_results["error"]})
-            else:
-                results_by_query.append({
-                    "query": query,
-                    "results": truncate_species_results(query_results),
-                })
+    if len(species_queries) == 1:
+        params = {"species_text": species_queries[0], 'limit': 50, 'add_sps':'t'}
+        log_call(endpoint, params)
+        results = await _post_json(endpoint, data=params)
+        if 'error' in results:
+            log_response_size(results)
+            return results
+        truncated_results = truncate_species_results(results)
 
-        response = {"results_by_query": results_by_query}
+        response = {"results": truncated_results}
         if notes:
             response["notes"] = notes
 
         log_response_size(response)
         return response
 
+    tasks = []
+    for query in species_queries:
+        params = {"species_text": query, 'limit': 50, 'add_sps':'t'}
+        log_call(endpoint, params)
+        tasks.append(_post_json(endpoint, data=params))
+
+    results = await asyncio.gather(*tasks)
+
+    results_by_query = []
+    for query, query_results in zip(species_queries, results):
+        if isinstance(query_results, dict) and 'error' in query_results:
+            results_by_query.append({"query": query, "error": query_results["error"]})
+        else:
+            results_by_query.append({
+                "query": query,
+                "results": truncate_species_results(query_results),
+            })
+
+    response = {"results_by_query": results_by_query}
+    if notes:
+        response["notes"] = notes
+
+    log_response_size(response)
+    return response
+
 
 @mcp.tool(title="STRING: Create a downloadable STRING result file")
 async def string_create_file(
@@ -1542,9 +1909,8 @@ async def string_create_file(
    
     endpoint = '/api/json/generate_chat_file'
 
-    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
-        log_call(endpoint, {"filename": filename, "file_content": f"<{len(content)} characters>"})
-        results = await _post_json(client, endpoint, data=params)
+    log_call(endpoint, {"filename": filename, "file_content": f"<{len(content)} characters>"})
+    results = await _post_json(endpoint, data=params)
 
     if isinstance(results, dict) and 'error' in results:
         log_response_size(results)
@@ -1622,32 +1988,43 @@ async def string_help(
 # ---- MCP server helper functions ----
 
 
+ENRICHMENT_CATEGORY_ALIASES = {
+    "biological process": "process",
+    "go biological process": "process",
+    "go process": "process",
+    "molecular function": "function",
+    "go molecular function": "function",
+    "go function": "function",
+    "cellular component": "component",
+    "go cellular component": "component",
+    "go component": "component",
+    "keywords": "keyword",
+    "reference publication": "pmid",
+    "reference publications": "pmid",
+    "publication": "pmid",
+    "publications": "pmid",
+    "pubmed": "pmid",
+    "local network cluster": "networkneighboral",
+    "local network clusters": "networkneighboral",
+    "network neighbor al": "networkneighboral",
+}
+
+
+@functools.lru_cache(maxsize=256)
 def _enrichment_category_key(category):
     if category is None:
         return ""
 
     key = " ".join(str(category).replace("_", " ").replace("-", " ").split()).lower()
-    aliases = {
-        "biological process": "process",
-        "go biological process": "process",
-        "go process": "process",
-        "molecular function": "function",
-        "go molecular function": "function",
-        "go function": "function",
-        "cellular component": "component",
-        "go cellular component": "component",
-        "go component": "component",
-        "keywords": "keyword",
-        "reference publication": "pmid",
-        "reference publications": "pmid",
-        "publication": "pmid",
-        "publications": "pmid",
-        "pubmed": "pmid",
-        "local network cluster": "networkneighboral",
-        "local network clusters": "networkneighboral",
-        "network neighbor al": "networkneighboral",
+    return ENRICHMENT_CATEGORY_ALIASES.get(key, key)
+
+
+def _enrichment_category_keys(rows):
+    """Normalize each distinct category once instead of once per row."""
+    return {
+        category: _enrichment_category_key(category)
+        for category in {row.get("category") for row in rows}
     }
-    return aliases.get(key, key)
 
 
 def _select_category_aware_rows(rows, total_limit):
@@ -1660,30 +2037,44 @@ def _select_category_aware_rows(rows, total_limit):
             category_order.append(category)
         groups[category].append(row)
 
-    allowances = {category: 0 for category in category_order}
-    remaining = total_limit
-
-    while remaining > 0:
-        progressed = False
-        for category in category_order:
-            if allowances[category] < len(groups[category]):
-                allowances[category] += 1
-                remaining -= 1
-                progressed = True
-                if remaining == 0:
-                    break
-        if not progressed:
+    # Same result as handing out one slot per category per round, but
+    # computed per category instead of per slot: raise a common level until
+    # the budget runs out, then give the leftover slots to the first
+    # categories (in original order) that still have rows.
+    remaining = max(total_limit, 0)
+    level = 0
+    open_categories = len(category_order)
+
+    for size in sorted(len(group) for group in groups.values()):
+        step = size - level
+        if step * open_categories > remaining:
             break
+        remaining -= step * open_categories
+        level = size
+        open_categories -= 1
 
-    selected = []
-    selected_counts = defaultdict(int)
-    for row in rows:
-        category = row.get("category")
-        if selected_counts[category] < allowances[category]:
-            selected.append(row)
-            selected_counts[category] += 1
+    if open_categories:
+        level += remaining // open_categories
+        remaining %= open_categories
+    else:
+        remaining = 0
 
-    return selected
+    allowances = {}
+    for category in category_order:
+        allowance = min(len(groups[category]), level)
+        if remaining and len(groups[category]) > level:
+            allowance += 1
+            remaining -= 1
+        allowances[category] = allowance
+
+    # Each category keeps its first `allowance` rows; filter the original list
+    # so the selection stays in STRING's order.
+    kept = {
+        id(row)
+        for category, group in groups.items()
+        for row in group[:allowances[category]]
+    }
+    return [row for row in rows if id(row) in kept]
 
 
 def _prepare_enrichment_rows(rows, gene_cutoff):
@@ -1726,25 +2117,15 @@ def _prepare_enrichment_rows(rows, gene_cutoff):
 
 
 def _build_enrichment_category_metadata(rows, selected_rows):
-    total_counts = defaultdict(int)
-    returned_counts = defaultdict(int)
-    category_order = []
-
-    for row in rows:
-        category = row.get("category")
-        if category not in total_counts:
-            category_order.append(category)
-        total_counts[category] += 1
-
-    for row in selected_rows:
-        returned_counts[row.get("category")] += 1
+    # Counter keeps first-seen order, so categories are listed in STRING's order
+    total_counts = Counter(row.get("category") for row in rows)
+    returned_counts = Counter(row.get("category") for row in selected_rows)
 
     category_summary = []
     truncated_categories = []
     omitted_categories = []
 
-    for category in category_order:
-        total_terms = total_counts[category]
+    for category, total_terms in total_counts.items():
         returned_terms = returned_counts[category]
         truncated = returned_terms < total_terms
         category_name = category if category is not None else "unknown"
@@ -1764,7 +2145,7 @@ def _build_enrichment_category_metadata(rows, selected_rows):
     return category_summary, truncated_categories, omitted_categories
 
 
-def truncate_enrichment(data, is_json, expand_category=None):
+def truncate_enrichment(data, expand_category=None):
     overview_term_cutoff = 300
     expanded_term_cutoff = 300
     overview_gene_cutoff = 11
@@ -1774,19 +2155,20 @@ def truncate_enrichment(data, is_json, expand_category=None):
     truncation_notes = []
     metadata = {}
 
-    if is_json.lower() != 'json' or not isinstance(data, list):
+    if not isinstance(data, list):
         return data, truncation_notes, metadata
 
     rows = [row for row in data if isinstance(row, dict)]
     original_rows = len(rows)
     requested_category = expand_category.strip() if isinstance(expand_category, str) else None
     metadata_source_rows = rows
+    category_keys = _enrichment_category_keys(rows)
 
     if requested_category:
         requested_key = _enrichment_category_key(requested_category)
         category_rows = [
             row for row in rows
-            if _enrichment_category_key(row.get("category")) == requested_key
+            if category_keys[row.get("category")] == requested_key
         ]
         metadata_source_rows = category_rows
         selected_rows = category_rows[:expanded_term_cutoff]
@@ -1818,15 +2200,16 @@ def truncate_enrichment(data, is_json, expand_category=None):
         selected_rows = rows
 
         if original_rows > overview_term_cutoff:
-            low_priority_counts = defaultdict(int)
+            low_priority_counts = {}
             category_limited_rows = []
             capped_low_priority = set()
 
             for row in rows:
-                category_key = _enrichment_category_key(row.get("category"))
+                category_key = category_keys[row.get("category")]
                 if category_key in low_priority_categories:
-                    low_priority_counts[category_key] += 1
-                    if low_priority_counts[category_key] > low_priority_overview_cutoff:
+                    count = low_priority_counts.get(category_key, 0) + 1
+                    low_priority_counts[category_key] = count
+                    if count > low_priority_overview_cutoff:
                         capped_low_priority.add(category_key)
                         continue
                 category_limited_rows.append(row)
@@ -1903,9 +2286,7 @@ def truncate_similarity_search(data):
     for hits in grouped.values():
         hits.sort(key=lambda x: x.get("bitscore", 0), reverse=True)
 
-    truncated = []
-    for query, hits in grouped.items():
-        truncated.extend(hits[:per_query_cutoff])
+    truncated = [hit for hits in grouped.values() for hit in hits[:per_query_cutoff]]
 
     if len(truncated) <= total_cutoff:
         return truncated, True, total_hits
@@ -2397,14 +2778,15 @@ def sort_and_truncate_functional_annotation(data, is_json, detail_for_term=None)
     if is_json.lower() == 'json':
 
         original_rows = len(data)
-        data = sorted(data, key=lambda x: x["ratio_in_set"], reverse=True)
+        ratio_in_set = operator.itemgetter("ratio_in_set")
 
         if detail_for_term:
             detail_key = detail_for_term.strip().lower()
-            data = [
-                row for row in data
-                if str(row.get("term", "")).strip().lower() == detail_key
-            ]
+            data = sorted(
+                (row for row in data if str(row.get("term", "")).strip().lower() == detail_key),
+                key=ratio_in_set,
+                reverse=True,
+            )
             if data:
                 truncation_notes.append(
                     f"Returned full input-protein lists for term {detail_for_term}."
@@ -2415,11 +2797,14 @@ def sort_and_truncate_functional_annotation(data, is_json, detail_for_term=None)
                 )
             return data, truncation_notes
 
-        if len(data) > size_cutoff:
-            data = data[:size_cutoff]
+        if original_rows > size_cutoff:
+            # only the top rows are kept, so select them without sorting the full list
+            data = heapq.nlargest(size_cutoff, data, key=ratio_in_set)
             truncation_notes.append(
                 f"The list was truncated to the first {size_cutoff} terms from {original_rows} original rows."
             )
+        else:
+            data = sorted(data, key=ratio_in_set, reverse=True)
 
         replaced_many = False
         removed_late_proteins = False
@@ -2451,54 +2836,44 @@ def sort_and_truncate_functional_annotation(data, is_json, detail_for_term=None)
 
     return data, truncation_notes
  
-def truncate_functional_terms(data, is_json):
+def truncate_functional_terms(data):
     term_size_cutoff = 10
+    top_term_count = 3
     protein_size_cutoff_top = 100    # cap for top terms
     protein_size_cutoff_rest = 25    # cap for later terms
     truncation_notes = []
 
-    if is_json.lower() == 'json':
-        filtered_data = []
-        original_rows = len(data)
-
-        for i, row in enumerate(data[:term_size_cutoff]):
-            if i < 3:
-                # top terms: allow up to 500
-                if len(row['preferredNames']) > protein_size_cutoff_top:
-                    original_protein_count = len(row['preferredNames'])
-                    row['preferredNames'] = row['preferredNames'][:protein_size_cutoff_top] + ["..."]
-                    row['stringIds'] = row['stringIds'][:protein_size_cutoff_top] + ["..."]
-                    row['proteinCount'] = original_protein_count
-                    row['truncated'] = True
-                else:
-                    row['proteinCount'] = len(row['preferredNames'])
-                    row['truncated'] = False
-            else:
-                # later terms: allow only 50
-                if len(row['preferredNames']) > protein_size_cutoff_rest:
-                    original_protein_count = len(row['preferredNames'])
-                    row['preferredNames'] = row['preferredNames'][:protein_size_cutoff_rest] + ["..."]
-                    row['stringIds'] = row['stringIds'][:protein_size_cutoff_rest] + ["..."]
-                    row['proteinCount'] = original_protein_count
-                    row['truncated'] = True
-                else:
-                    row['proteinCount'] = len(row['preferredNames'])
-                    row['truncated'] = False
-
-            filtered_data.append(row)
-
-        if len(filtered_data) < original_rows:
-            truncation_notes.append(
-                f"Functional-term results were truncated to the top {term_size_cutoff} terms for readability."
-            )
-
-        data = filtered_data
+    if not isinstance(data, list):
+        return data, truncation_notes
+
+    original_rows = len(data)
+    filtered_data = data[:term_size_cutoff]
+
+    for i, row in enumerate(filtered_data):
+        protein_cutoff = protein_size_cutoff_top if i < top_term_count else protein_size_cutoff_rest
+        protein_count = len(row['preferredNames'])
+        row['proteinCount'] = protein_count
+        row['truncated'] = protein_count > protein_cutoff
+        if row['truncated']:
+            # rows are freshly decoded per call, so trim the lists in place
+            for field in ('preferredNames', 'stringIds'):
+                del row[field][protein_cutoff:]
+                row[field].append("...")
+
+    if len(filtered_data) < original_rows:
+        truncation_notes.append(
+            f"Functional-term results were truncated to the top {term_size_cutoff} terms for readability."
+        )
 
-    return data, truncation_notes
+    return filtered_data, truncation_notes
 
-def log_response_size(resp):
-    if log_verbosity['size']:
+if LOG_SIZE:
+    def log_response_size(resp):
         print("Response size:", object_size(resp), file=sys.stderr)
+else:
+    # size logging is off: tools still call log_response_size, so make it a no-op
+    def log_response_size(resp):
+        pass
 
 def object_size(obj):
     if isinstance(obj, str):
@@ -2514,24 +2889,53 @@ def object_size(obj):
 
 
 
-def log_call(endpoint, params):
+if LOG_CALL or LOG_PARAMS:
+    def log_call(endpoint, params):
+        # build the whole entry first: stderr is unbuffered, so each print is a separate write
+        lines = []
 
-    if log_verbosity['call']:
-        print(f"Call: {endpoint}", file=sys.stderr)
- 
-    if log_verbosity['params']:
-        print("Params:", file=sys.stderr)
-        for param, value in params.items():
-            print(f'    {param}: {str(value)}', file=sys.stderr)
+        if LOG_CALL:
+            lines.append(f"Call: {endpoint}")
+
+        if LOG_PARAMS:
+            lines.append("Params:")
+            lines.extend(f'    {param}: {str(value)}' for param, value in params.items())
+
+        sys.stderr.write("\n".join(lines) + "\n")
+else:
+    # call logging is off: tools still call log_call, so make it a no-op
+    def log_call(endpoint, params):
+        pass
 
 
 # ---- MCP server runner ----
 
+async def _warm_up_connection():
+    """Open the pooled connection to STRING ahead of the first tool call (DNS, TCP, TLS)."""
+    try:
+        await http_client.head("/", timeout=5.0)
+    except Exception:
+        pass  # best effort; the first tool call will connect instead
+
+
+async def serve():
+    warm_up = asyncio.create_task(_warm_up_connection())
+    try:
+        await mcp.run_async(
+            transport="streamable-http",
+            host="0.0.0.0",
+            port=server_port,
+            log_level=server_log_level,
+            stateless_http=True,
+        )
+    finally:
+        warm_up.cancel()
+        # release pooled STRING connections on shutdown
+        await http_client.aclose()
+
+
 if __name__ == "__main__":
-    mcp.run(
-        transport="streamable-http",
-        host="0.0.0.0",
-        port=server_port,
-        log_level="info",
-        stateless_http=True,
-    )
+    if uvloop is not None:
+        uvloop.run(serve())
+    else:
+        asyncio.run(serve())
@@ -1,3 +1,4 @@
+from types import MappingProxyType
 
 HELP_TOPICS = {
     "gsea": (
@@ -138,3 +139,6 @@ HELP_TOPICS = {
         "PubMed: https://pubmed.ncbi.nlm.nih.gov/39558183/"
     ),
 }
+
+# read-only: topics are shared by every session and must not be changed at runtime
+HELP_TOPICS = MappingProxyType(HELP_TOPICS)